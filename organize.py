@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+사진 정리 파이프라인: 중복 검사 → 백업 → 태깅을 순서대로 실행합니다.
+"""
+
+import os
+import sys
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from backup import auto_backup_photos
+from duplicate_check import find_duplicate_photos_fast
+from photo_tagger import tag_photos_batch
+
+
+def main(source_dir="./photos", backup_root="./backup"):
+    # 중복 검사를 원본 폴더에서 먼저 돌리고, 그룹당 한 장만 남겨 백업
+    # (백업본을 다시 스캔하는 것보다 복사량 자체가 줄어듦)
+    duplicates = find_duplicate_photos_fast(source_dir)
+    skip = {path for group in duplicates for path in group[1:]}
+    for group in duplicates:
+        print(f"🔁 중복 사진 그룹: {group}")
+
+    backup_dir = auto_backup_photos(source_dir, backup_root, skip=skip)
+
+    # 경로를 먼저 모은 뒤 배치 API로 한꺼번에 태깅
+    with os.scandir(backup_dir) as entries:
+        photo_paths = [entry.path for entry in entries
+                       if entry.is_file(follow_symlinks=False)]
+    tags_per_photo = tag_photos_batch(photo_paths)
+    for path, tags in zip(photo_paths, tags_per_photo):
+        print(f"🏷️ {os.path.basename(path)}: {tags}")
+
+
+if __name__ == "__main__":
+    main()
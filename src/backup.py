@@ -1,17 +1,71 @@
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-def auto_backup_photos(source_dir="./photos", backup_root="./backup"):
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# btrfs/XFS의 reflink ioctl (FICLONE): 데이터 이동 없이 즉시 복제
+_FICLONE = 0x40049409
+
+
+def _copy_file(src_file, dst_file, size):
+    """
+    reflink → copy_file_range → shutil.copyfile 순으로 시도하는 파일 복사
+    (가능하면 커널 안에서 복사해 파이썬을 거치는 read/write 루프를 피함)
+    """
+    try:
+        src_fd = os.open(src_file, os.O_RDONLY)
+        try:
+            dst_fd = os.open(dst_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                if fcntl is not None:
+                    try:
+                        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+                        return
+                    except OSError:
+                        pass
+                if hasattr(os, 'copy_file_range'):
+                    copied = 0
+                    while copied < size:
+                        n = os.copy_file_range(src_fd, dst_fd, size - copied)
+                        if n == 0:
+                            break
+                        copied += n
+                    if copied >= size:
+                        return
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+    except OSError:
+        pass
+    # 폴백 (리눅스의 copyfile은 내부적으로 sendfile 사용)
+    shutil.copyfile(src_file, dst_file)
+
+
+def auto_backup_photos(source_dir="./photos", backup_root="./backup", skip=None):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_dir = os.path.join(backup_root, timestamp)
     os.makedirs(backup_dir, exist_ok=True)
 
-    for filename in os.listdir(source_dir):
-        src_file = os.path.join(source_dir, filename)
-        dst_file = os.path.join(backup_dir, filename)
-        if os.path.isfile(src_file):
-            shutil.copy2(src_file, dst_file)
+    skip = skip or set()
+    with os.scandir(source_dir) as entries:
+        files = [(entry.path, os.path.join(backup_dir, entry.name), entry.stat().st_size)
+                 for entry in entries
+                 if entry.is_file(follow_symlinks=False) and entry.path not in skip]
+
+    # SSD 큐를 채우도록 몇 개의 파일을 동시에 복사
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in executor.map(lambda args: _copy_file(*args), files):
+            pass
+
+    # 메타데이터(수정시각 등)는 마지막에 한꺼번에 복사
+    for src_file, dst_file, _ in files:
+        shutil.copystat(src_file, dst_file)
 
     print(f"📁 백업 완료: {backup_dir}")
     return backup_dir
@@ -1,14 +1,216 @@
-def find_duplicate_photos(photo_list):
+import filecmp
+import mmap
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import blake3
+import numpy as np
+import xxhash
+
+# 이보다 작은 파일은 mmap으로 한 번에 해시 (RSS 제한을 위해 큰 파일은 청크 방식 유지)
+_MMAP_THRESHOLD = 64 * 1024 * 1024
+
+# 전체 해시 디스크 캐시: 파일이 안 바뀌었으면 지난 스캔의 해시를 재사용
+_CACHE_PATH = os.path.expanduser('~/.photo_organizer/hashcache.db')
+
+# 청크 읽기용 재사용 버퍼 (readinto로 반복 할당 없이 1 MiB씩 읽음)
+# 해시 패스가 스레드 풀에서 돌기 때문에 스레드별로 하나씩 만들어 재사용
+_hash_local = threading.local()
+
+
+def _hash_buffer():
+    buf = getattr(_hash_local, 'buf', None)
+    if buf is None:
+        buf = _hash_local.buf = bytearray(1 << 20)
+    return buf
+
+
+def calculate_file_hash_fast(filepath):
     """
-    사진 리스트에서 중복된 사진을 찾는 함수 (예시 틀)
+    파일 전체의 BLAKE3 해시를 계산하는 함수
+    (BLAKE3는 SIMD + 멀티코어 트리 해시라 큰 사진에서 MD5보다 훨씬 빠름)
     """
-    duplicates = set()
-    seen = set()
+    hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+    try:
+        file_size = os.path.getsize(filepath)
+        fd = os.open(filepath, os.O_RDONLY)
+        try:
+            if hasattr(os, 'posix_fadvise'):
+                # 순차 읽기 힌트: 커널이 readahead 윈도우를 키움
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            with open(fd, 'rb', closefd=False) as f:
+                if 0 < file_size < _MMAP_THRESHOLD:
+                    # 작은/중간 파일은 mmap으로 한 번의 update() 호출로 해시
+                    # (청크 루프의 read/update 반복 오버헤드 제거)
+                    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                        mv = memoryview(mm)
+                        try:
+                            hasher.update(mv)
+                        finally:
+                            mv.release()
+                else:
+                    buf = _hash_buffer()
+                    mv = memoryview(buf)
+                    while n := f.readinto(buf):
+                        hasher.update(mv[:n])
+            if hasattr(os, 'posix_fadvise'):
+                # 다시 읽을 일 없는 페이지라고 알려 페이지 캐시 오염을 방지
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+        # 16진수 문자열 대신 바이트 다이제스트 그대로 (절반 크기, 인코딩 생략)
+        return hasher.digest()
+    except OSError:
+        return None
+
+
+def prefix_fingerprint(filepath, prefix_size=4096):
+    """
+    파일 앞부분만 읽어 xxHash3 지문을 계산하는 함수 (중복 후보 선별용)
+    (사진은 EXIF 헤더부터 달라지므로 앞 4 KiB 한 번 읽는 것으로 충분)
+    """
+    try:
+        # 버퍼드 파일 객체 없이 fd에서 바로 한 번 읽음 (파일당 오버헤드 최소화)
+        fd = os.open(filepath, os.O_RDONLY)
+        try:
+            return xxhash.xxh3_64_intdigest(os.pread(fd, prefix_size, 0))
+        finally:
+            os.close(fd)
+    except OSError:
+        return None
+
+
+def _open_hash_cache():
+    os.makedirs(os.path.dirname(_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(_CACHE_PATH)
+    conn.execute('CREATE TABLE IF NOT EXISTS hashes '
+                 '(path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, hash BLOB)')
+    return conn
+
+
+def hash_files_cached(filepaths, executor):
+    """
+    디스크 캐시를 거쳐 파일들의 전체 해시를 path→해시 딕셔너리로 반환하는 함수
+    ((path, size, mtime)이 지난 스캔과 같으면 다시 읽지 않고 캐시 해시를 재사용)
+    """
+    full_hashes = {}
+    to_hash = []
+    stats = {}
+    conn = _open_hash_cache()
+    try:
+        for filepath in filepaths:
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                full_hashes[filepath] = None
+                continue
+            stats[filepath] = stat
+            row = conn.execute(
+                'SELECT hash FROM hashes WHERE path = ? AND size = ? AND mtime_ns = ?',
+                (filepath, stat.st_size, stat.st_mtime_ns)).fetchone()
+            if row and isinstance(row[0], bytes):  # 예전 16진수 캐시 항목은 무시
+                full_hashes[filepath] = row[0]
+            else:
+                to_hash.append(filepath)
+
+        new_hashes = list(zip(to_hash, executor.map(calculate_file_hash_fast, to_hash)))
+        # 새로 계산한 해시는 트랜잭션 하나로 모아서 기록
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?)',
+                [(path, stats[path].st_size, stats[path].st_mtime_ns, file_hash)
+                 for path, file_hash in new_hashes if file_hash])
+        full_hashes.update(new_hashes)
+    finally:
+        conn.close()
+    return full_hashes
+
+
+def find_duplicate_photos_by_size(folder_path):
+    """
+    크기가 같은 파일끼리 묶어 중복 후보 그룹을 반환하는 함수
+    (scandir의 DirEntry가 stat 정보를 들고 있어 파일당 syscall이 줄어듦)
+    """
+    # 대부분을 차지하는 단독 파일은 리스트로 감싸지 않고 size→path 항목
+    # 하나로만 들고 있다가, 같은 크기가 또 나올 때만 그룹 리스트로 승격
+    singletons = {}
+    size_groups = {}
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            size = entry.stat().st_size
+            if size in size_groups:
+                size_groups[size].append(entry.path)
+            elif size in singletons:
+                size_groups[size] = [singletons.pop(size), entry.path]
+            else:
+                singletons[size] = entry.path
+    return size_groups
+
+
+def find_duplicate_photos_fast(folder_path):
+    """
+    폴더 안의 중복 사진 그룹을 찾는 함수
+    (크기 → 샘플 해시 → 전체 해시 순으로 후보를 좁혀가며 비교)
+    """
+    size_groups = find_duplicate_photos_by_size(folder_path)
+
+    duplicates = []
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # 지문 패스: 크기가 같은 후보 전체를 스레드 풀에 한꺼번에 제출
+        # (해시 update는 GIL을 놓기 때문에 코어 수만큼 거의 선형으로 빨라짐)
+        candidates = [(size, path)
+                      for size, paths in size_groups.items()
+                      for path in paths]
+        fingerprints = executor.map(prefix_fingerprint,
+                                    [path for _, path in candidates])
+        sample_hash_groups = defaultdict(list)
+        for (size, path), fingerprint in zip(candidates, fingerprints):
+            if fingerprint is not None:
+                sample_hash_groups[(size, fingerprint)].append(path)
+
+        # 파일이 정확히 두 개인 그룹은 해시 대신 바이트 단위 직접 비교가 더 쌈
+        # (두 파일을 각각 전체 해시하는 것보다 한 번의 memcmp 비교로 끝남)
+        pair_groups = []
+        full_candidates = []
+        for file_paths in sample_hash_groups.values():
+            if len(file_paths) == 2:
+                pair_groups.append(file_paths)
+            elif len(file_paths) > 2:
+                full_candidates.extend(file_paths)
+
+        # 전체 해시 패스: 지문까지 같은 3개 이상 그룹만 같은 풀에서 전체 해시
+        full_hashes = hash_files_cached(full_candidates, executor)
+
+        for first, second in pair_groups:
+            if filecmp.cmp(first, second, shallow=False):
+                duplicates.append([first, second])
 
-    for photo in photo_list:
-        if photo in seen:
-            duplicates.add(photo)
-        else:
-            seen.add(photo)
+        # 해시 버킷팅: 딕셔너리 삽입 대신 다이제스트 앞 8바이트를 uint64 배열로
+        # 모아 C 정렬 + 경계 탐지로 같은 해시 구간을 찾음 (크기/지문이 이미 같은
+        # 후보끼리만 비교되므로 전체를 한 배열로 묶어도 결과는 동일)
+        hashed = [(path, full_hashes[path]) for path in full_candidates
+                  if full_hashes[path]]
+        if hashed:
+            digest_keys = np.frombuffer(
+                b''.join(file_hash[:8] for _, file_hash in hashed),
+                dtype=np.uint64)
+            order = np.argsort(digest_keys, kind='stable')
+            sorted_keys = digest_keys[order]
+            boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+            start = 0
+            for end in [*boundaries, len(hashed)]:
+                if end - start > 1:
+                    paths = [hashed[order[i]][0] for i in range(start, end)]
+                    # 해시가 같아도 마지막에 바이트 비교로 충돌 가능성을 배제
+                    verified = [paths[0]] + [path for path in paths[1:]
+                                             if filecmp.cmp(paths[0], path, shallow=False)]
+                    if len(verified) > 1:
+                        duplicates.append(verified)
+                start = end
 
-    return list(duplicates)
+    return duplicates